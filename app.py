@@ -1,628 +1,1021 @@
-from flask import Flask, jsonify, request, render_template, abort, send_file
-import json
-import os
-import threading
-import uuid
-import re
-import time
-import logging
-import errno
-import shutil
-import random
-import copy
-
-app = Flask(__name__, static_folder='static', template_folder='templates')
-# Basic logging for debugging slow I/O
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-DATA_FILE = os.path.join(DATA_DIR, 'kanban.json')
-_lock = threading.Lock()
-
-DEFAULT_CARD_COLOR = '#5b2e8a'
-
-DEFAULT_BOARD = {
-    "columns": [
-    {"id": "todo", "title": "To Do", "cards": [], "color": "#1f77b4", "hidden": False},
-    {"id": "inprogress", "title": "In Progress", "cards": [], "color": "#ff8c00", "hidden": False},
-    {"id": "blocked", "title": "Blocked", "cards": [], "color": "#d62728", "hidden": False},
-    {"id": "done", "title": "Done", "cards": [], "color": "#2ca02c", "hidden": False}
-    ],
-    "projects": []
-}
-
-
-def _sanitize_card(card):
-    if not isinstance(card, dict):
-        return None
-    sanitized = {}
-    sanitized['id'] = str(card.get('id') or uuid.uuid4())
-    sanitized['title'] = str(card.get('title') or '').strip() or 'Untitled'
-    sanitized['description'] = str(card.get('description') or '')
-    sanitized['links'] = _clean_links(card.get('links'))
-    project_name = (card.get('project') or '').strip()
-    if project_name:
-        sanitized['project'] = project_name
-    assignee = (card.get('assignee') or '').strip()
-    if assignee:
-        sanitized['assignee'] = assignee
-    color = card.get('color')
-    sanitized['color'] = color if color else DEFAULT_CARD_COLOR
-    return sanitized
-
-
-def _normalize_board(data):
-    if not isinstance(data, dict):
-        data = {}
-    if 'columns' not in data or not isinstance(data['columns'], list):
-        data['columns'] = []
-    if 'projects' not in data or not isinstance(data['projects'], list):
-        data['projects'] = []
-
-    normalized_columns = []
-    for col in data['columns']:
-        if not isinstance(col, dict):
-            continue
-        col_id = col.get('id') or str(uuid.uuid4())
-        title = str(col.get('title') or '').strip() or 'Untitled'
-        color = col.get('color') or '#9aa0a6'
-        hidden = bool(col.get('hidden', False))
-        cards_payload = col.get('cards') if isinstance(col.get('cards'), list) else []
-        normalized_cards = []
-        seen_ids = set()
-        for card in cards_payload:
-            sanitized = _sanitize_card(card)
-            if not sanitized:
-                continue
-            if sanitized['id'] in seen_ids:
-                sanitized['id'] = str(uuid.uuid4())
-            seen_ids.add(sanitized['id'])
-            normalized_cards.append(sanitized)
-        normalized_columns.append({'id': col_id, 'title': title, 'color': color, 'hidden': hidden, 'cards': normalized_cards})
-
-    normalized_projects = []
-    seen_projects = set()
-    for proj in data['projects']:
-        if not isinstance(proj, dict):
-            continue
-        name = (proj.get('name') or '').strip()
-        if not name or name in seen_projects:
-            continue
-        normalized_projects.append({'name': name, 'color': proj.get('color') or DEFAULT_CARD_COLOR})
-        seen_projects.add(name)
-
-    data['columns'] = normalized_columns
-    data['projects'] = normalized_projects
-    return data
-
-
-def _get_projects(board):
-    projects = board.get('projects')
-    if not isinstance(projects, list):
-        projects = []
-        board['projects'] = projects
-    return projects
-
-
-def _generate_unique_color(board, attempts=32):
-    existing = { (proj.get('color') or '').lower() for proj in _get_projects(board) if proj.get('color') }
-    for _ in range(attempts):
-        color = f"#{random.randint(0, 0xFFFFFF):06x}"
-        if color.lower() not in existing:
-            return color
-    return f"#{random.randint(0, 0xFFFFFF):06x}"
-
-
-def _ensure_project(board, project_name):
-    project_name = (project_name or '').strip()
-    if not project_name:
-        return None
-    projects = _get_projects(board)
-    existing = next((p for p in projects if p.get('name') == project_name), None)
-    if existing:
-        if not existing.get('color'):
-            existing['color'] = DEFAULT_CARD_COLOR
-        return existing
-    color = _generate_unique_color(board)
-    project = {'name': project_name, 'color': color}
-    projects.append(project)
-    return project
-
-
-def _find_project(board, project_name):
-    if not project_name:
-        return None
-    projects = _get_projects(board)
-    for proj in projects:
-        if proj.get('name') == project_name:
-            return proj
-    return None
-
-
-def _apply_project_color_to_cards(board, project_name, color):
-    if not project_name:
-        return
-    for col in board.get('columns', []):
-        for card in col.get('cards', []):
-            if card.get('project') == project_name:
-                if color:
-                    card['color'] = color
-                else:
-                    card['color'] = DEFAULT_CARD_COLOR
-
-
-def _update_project_references(board, old_name, new_name=None, project_color=None):
-    for col in board.get('columns', []):
-        for card in col.get('cards', []):
-            if card.get('project') == old_name:
-                if new_name:
-                    card['project'] = new_name
-                    if project_color:
-                        card['color'] = project_color
-                else:
-                    card.pop('project', None)
-                    card['color'] = DEFAULT_CARD_COLOR
-
-
-def _ensure_data_file():
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-    if not os.path.exists(DATA_FILE):
-        logger.info('Creating new blank kanban board at %s', DATA_FILE)
-        _save_data(DEFAULT_BOARD)
-
-
-def _load_data():
-    _ensure_data_file()
-    start = time.perf_counter()
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        data = _normalize_board(data)
-    elapsed = time.perf_counter() - start
-    if elapsed > 0.5:
-        logger.warning('Slow _load_data: %.3fs', elapsed)
-    return data
-
-
-def _save_data(data):
-    # Use lock to avoid concurrent writes from threads
-    with _lock:
-        start = time.perf_counter()
-        tmp = DATA_FILE + '.tmp'
-        with open(tmp, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        try:
-            os.replace(tmp, DATA_FILE)
-        except OSError as exc:
-            recoverable = {errno.EXDEV, errno.EBUSY, errno.EACCES, errno.EPERM}
-            if exc.errno in recoverable:
-                shutil.copyfile(tmp, DATA_FILE)
-                os.remove(tmp)
-            else:
-                os.remove(tmp)
-                raise
-        elapsed = time.perf_counter() - start
-        if elapsed > 0.5:
-            logger.warning('Slow _save_data: %.3fs', elapsed)
-
-
-# Ensure the data file exists as soon as the app module loads
-_ensure_data_file()
-
-
-def _clean_links(raw_links):
-    """Return a list of {'text','url'} objects with minimal validation."""
-    cleaned = []
-    if isinstance(raw_links, list):
-        for item in raw_links:
-            if not isinstance(item, dict):
-                continue
-            text = str(item.get('text', '') or '').strip()
-            url = str(item.get('url', '') or '').strip()
-            if not url:
-                continue
-            cleaned.append({'text': text or url, 'url': url})
-    return cleaned
-
-
-def _merge_boards(existing, incoming):
-    base = copy.deepcopy(_normalize_board(copy.deepcopy(existing)))
-    incoming_board = _normalize_board(copy.deepcopy(incoming))
-
-    columns_lookup = {col['id']: col for col in base.get('columns', [])}
-    for inc_col in incoming_board.get('columns', []):
-        col_id = inc_col['id']
-        if col_id in columns_lookup:
-            target = columns_lookup[col_id]
-            target['title'] = inc_col.get('title', target['title'])
-            target['color'] = inc_col.get('color', target.get('color'))
-            target['hidden'] = bool(inc_col.get('hidden', target.get('hidden', False)))
-            existing_ids = {card['id'] for card in target.get('cards', [])}
-            for card in inc_col.get('cards', []):
-                sanitized = _sanitize_card(card)
-                if not sanitized:
-                    continue
-                if sanitized['id'] in existing_ids:
-                    sanitized['id'] = str(uuid.uuid4())
-                existing_ids.add(sanitized['id'])
-                target.setdefault('cards', []).append(sanitized)
-        else:
-            base.setdefault('columns', []).append(copy.deepcopy(inc_col))
-            columns_lookup[col_id] = base['columns'][-1]
-
-    projects = base.setdefault('projects', [])
-    project_lookup = {proj['name']: proj for proj in projects if proj.get('name')}
-    for proj in incoming_board.get('projects', []):
-        name = proj.get('name')
-        if not name:
-            continue
-        if name in project_lookup:
-            if proj.get('color'):
-                project_lookup[name]['color'] = proj['color']
-        else:
-            projects.append({'name': name, 'color': proj.get('color') or DEFAULT_CARD_COLOR})
-            project_lookup[name] = projects[-1]
-
-    return _normalize_board(base)
-
-
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-
-@app.route('/api/board', methods=['GET'])
-def get_board():
-    return jsonify(_load_data())
-
-
-@app.route('/api/board/export', methods=['GET'])
-def export_board():
-    _ensure_data_file()
-    return send_file(DATA_FILE, mimetype='application/json', as_attachment=True, download_name='kanban.json')
-
-
-@app.route('/api/board/import', methods=['POST'])
-def import_board():
-    upload = request.files.get('file')
-    if not upload:
-        return jsonify({'error': 'Import file is required'}), 400
-    try:
-        payload = json.load(upload)
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Uploaded file is not valid JSON'}), 400
-
-    mode = (request.form.get('mode') or 'merge').lower()
-    if mode not in {'merge', 'replace'}:
-        mode = 'merge'
-
-    if mode == 'replace':
-        board = _normalize_board(payload)
-    else:
-        current = _load_data()
-        board = _merge_boards(current, payload)
-
-    _save_data(board)
-    return jsonify({'status': 'ok', 'mode': mode})
-
-
-@app.route('/api/card', methods=['POST'])
-def create_card():
-    data = request.get_json() or {}
-    title = data.get('title')
-    description = data.get('description', '')
-    column_id = data.get('column', 'todo')
-    color = data.get('color')
-    hidden = data.get('hidden')
-    project_name = (data.get('project') or '').strip()
-    assignee = (data.get('assignee') or '').strip()
-    links = _clean_links(data.get('links'))
-    if not title:
-        return jsonify({'error': 'title required'}), 400
-
-    board = _load_data()
-    card = {
-        'id': str(uuid.uuid4()),
-        'title': title,
-        'description': description,
-        'links': links
-    }
-    if assignee:
-        card['assignee'] = assignee
-    project_details = None
-    if project_name:
-        project_details = _ensure_project(board, project_name)
-        card['project'] = project_name
-        if project_details and project_details.get('color'):
-            card['color'] = project_details['color']
-
-    if color and not project_details:
-        card['color'] = color
-    if 'color' not in card:
-        card['color'] = DEFAULT_CARD_COLOR
-
-    for col in board['columns']:
-        if col['id'] == column_id:
-            col['cards'].append(card)
-            _save_data(board)
-            return jsonify(card), 201
-    return jsonify({'error': 'column not found'}), 404
-
-
-@app.route('/api/card/<card_id>', methods=['PUT'])
-def update_card(card_id):
-    data = request.get_json() or {}
-    target_col = data.get('column')
-    position = data.get('position')  # optional integer
-    title = data.get('title')
-    description = data.get('description')
-    color = data.get('color')
-    links = data.get('links')
-    project_payload = data.get('project') if 'project' in data else None
-    assignee_payload = data.get('assignee') if 'assignee' in data else None
-
-    board = _load_data()
-    # find and remove card from any column
-    card_obj = None
-    original_column_id = None
-    original_position = None
-    for col in board['columns']:
-        for i, c in enumerate(col['cards']):
-            if c['id'] == card_id:
-                card_obj = c
-                original_column_id = col['id']
-                original_position = i
-                del col['cards'][i]
-                break
-        if card_obj:
-            break
-
-    if not card_obj:
-        return jsonify({'error': 'card not found'}), 404
-
-    # update fields
-    if title is not None:
-        card_obj['title'] = title
-    if description is not None:
-        card_obj['description'] = description
-    if color is not None:
-        card_obj['color'] = color
-    if project_payload is not None:
-        normalized_project = (project_payload or '').strip()
-        if normalized_project:
-            project_details = _ensure_project(board, normalized_project)
-            card_obj['project'] = normalized_project
-            if project_details and project_details.get('color'):
-                card_obj['color'] = project_details['color']
-        else:
-            card_obj.pop('project', None)
-            if color is None:
-                card_obj['color'] = DEFAULT_CARD_COLOR
-    if assignee_payload is not None:
-        normalized_assignee = (assignee_payload or '').strip()
-        if normalized_assignee:
-            card_obj['assignee'] = normalized_assignee
-        else:
-            card_obj.pop('assignee', None)
-    if links is not None:
-        card_obj['links'] = _clean_links(links)
-
-    if card_obj.get('project'):
-        project_details = _find_project(board, card_obj['project'])
-        if project_details and project_details.get('color'):
-            card_obj['color'] = project_details['color']
-    elif 'color' not in card_obj:
-        card_obj['color'] = DEFAULT_CARD_COLOR
-
-    # place into target column
-    destination_column_id = target_col or original_column_id
-    destination_column = None
-    if destination_column_id:
-        destination_column = next((c for c in board['columns'] if c['id'] == destination_column_id), None)
-
-    if target_col and destination_column is None:
-        return jsonify({'error': 'target column not found'}), 404
-
-    if destination_column is None:
-        destination_column = board['columns'][0]
-
-    if target_col:
-        # honor supplied position when explicitly moving columns
-        if position is None or position >= len(destination_column['cards']):
-            destination_column['cards'].append(card_obj)
-        else:
-            destination_column['cards'].insert(max(0, int(position)), card_obj)
-    else:
-        # keep original relative order when staying in same column
-        insert_idx = original_position if original_position is not None else len(destination_column['cards'])
-        insert_idx = min(insert_idx, len(destination_column['cards']))
-        destination_column['cards'].insert(insert_idx, card_obj)
-
-    _save_data(board)
-    return jsonify(card_obj)
-
-
-@app.route('/api/card/<card_id>', methods=['DELETE'])
-def delete_card(card_id):
-    board = _load_data()
-    for col in board['columns']:
-        for i, c in enumerate(col['cards']):
-            if c['id'] == card_id:
-                del col['cards'][i]
-                _save_data(board)
-                return jsonify({'deleted': True})
-    return jsonify({'error': 'card not found'}), 404
-
-
-@app.route('/api/columns', methods=['GET'])
-def get_columns():
-    board = _load_data()
-    cols = [{'id': c['id'], 'title': c['title'], 'color': c.get('color'), 'hidden': bool(c.get('hidden', False))} for c in board['columns']]
-    return jsonify({'columns': cols})
-
-
-@app.route('/api/column', methods=['POST'])
-def create_column():
-    data = request.get_json() or {}
-    title = data.get('title')
-    position = data.get('position')
-    color = data.get('color') or '#9aa0a6'
-    if not title:
-        return jsonify({'error': 'title required'}), 400
-    board = _load_data()
-
-    def _slug(s):
-        s = s.lower()
-        s = re.sub(r'[^a-z0-9]+', '-', s).strip('-')
-        return s or str(uuid.uuid4())
-
-    col_id = _slug(title)
-    ids = {c['id'] for c in board['columns']}
-    if col_id in ids:
-        col_id = f"{col_id}-{str(uuid.uuid4())[:8]}"
-
-    hidden = bool(data.get('hidden', False))
-    col = {'id': col_id, 'title': title, 'cards': [], 'color': color, 'hidden': hidden}
-    if position is None or position >= len(board['columns']):
-        board['columns'].append(col)
-    else:
-        board['columns'].insert(max(0, int(position)), col)
-    _save_data(board)
-    return jsonify(col), 201
-
-
-@app.route('/api/column/<col_id>', methods=['PUT'])
-def update_column(col_id):
-    data = request.get_json() or {}
-    title = data.get('title')
-    position = data.get('position')
-    color = data.get('color')
-    hidden = data.get('hidden')
-    board = _load_data()
-    idx = next((i for i, c in enumerate(board['columns']) if c['id'] == col_id), None)
-    if idx is None:
-        return jsonify({'error': 'column not found'}), 404
-    col = board['columns'][idx]
-    if title is not None:
-        col['title'] = title
-    if color is not None:
-        col['color'] = color
-    if hidden is not None:
-        col['hidden'] = bool(hidden)
-    if position is not None:
-        pos = max(0, int(position))
-        board['columns'].pop(idx)
-        board['columns'].insert(min(pos, len(board['columns'])), col)
-    _save_data(board)
-    return jsonify(col)
-
-
-@app.route('/api/column/<col_id>', methods=['DELETE'])
-def delete_column(col_id):
-    data = request.get_json() or {}
-    move_to = data.get('move_to')
-    board = _load_data()
-    idx = next((i for i, c in enumerate(board['columns']) if c['id'] == col_id), None)
-    if idx is None:
-        return jsonify({'error': 'column not found'}), 404
-    col = board['columns'].pop(idx)
-    if move_to:
-        target = next((c for c in board['columns'] if c['id'] == move_to), None)
-        if target is not None:
-            target['cards'].extend(col.get('cards', []))
-    _save_data(board)
-    return jsonify({'deleted': True})
-
-
-@app.route('/api/projects', methods=['GET'])
-def get_projects():
-    board = _load_data()
-    projects = _get_projects(board)
-    return jsonify({'projects': projects})
-
-
-@app.route('/api/project', methods=['POST'])
-def create_project():
-    data = request.get_json() or {}
-    name = (data.get('name') or '').strip()
-    color = data.get('color')
-    position = data.get('position')
-    if not name:
-        return jsonify({'error': 'name required'}), 400
-
-    board = _load_data()
-    projects = _get_projects(board)
-    if any(proj.get('name') == name for proj in projects):
-        return jsonify({'error': 'project name must be unique'}), 400
-    if not color:
-        color = _generate_unique_color(board)
-    project = {'name': name, 'color': color}
-
-    if position is None or position >= len(projects):
-        projects.append(project)
-    else:
-        insert_idx = max(0, int(position))
-        projects.insert(insert_idx, project)
-
-    _save_data(board)
-    return jsonify(project), 201
-
-
-@app.route('/api/project/<int:project_idx>', methods=['PUT'])
-def update_project(project_idx):
-    data = request.get_json() or {}
-    board = _load_data()
-    projects = _get_projects(board)
-
-    if project_idx < 0 or project_idx >= len(projects):
-        return jsonify({'error': 'project not found'}), 404
-
-    project = projects[project_idx]
-    name = data.get('name')
-    color = data.get('color')
-    position = data.get('position')
-
-    if name is not None:
-        name = name.strip()
-        if not name:
-            return jsonify({'error': 'name required'}), 400
-        if any(i != project_idx and p.get('name') == name for i, p in enumerate(projects)):
-            return jsonify({'error': 'project name must be unique'}), 400
-        old_name = project.get('name')
-        if name != old_name:
-            project['name'] = name
-            _update_project_references(board, old_name, name, project.get('color'))
-    if color is not None:
-        project['color'] = color
-        _apply_project_color_to_cards(board, project['name'], color)
-
-    if position is not None:
-        mover = projects.pop(project_idx)
-        insert_idx = max(0, int(position))
-        if insert_idx > len(projects):
-            insert_idx = len(projects)
-        projects.insert(insert_idx, mover)
-
-    _save_data(board)
-    return jsonify(project)
-
-
-@app.route('/api/project/<int:project_idx>', methods=['DELETE'])
-def delete_project(project_idx):
-    board = _load_data()
-    projects = _get_projects(board)
-
-    if project_idx < 0 or project_idx >= len(projects):
-        return jsonify({'error': 'project not found'}), 404
-
-    removed = projects.pop(project_idx)
-    _update_project_references(board, removed.get('name'), None)
-    _save_data(board)
-    return jsonify({'deleted': True})
-
-
-if __name__ == '__main__':
-    _ensure_data_file()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+from flask import Flask, jsonify, request, render_template, abort, send_file, g, has_request_context
+import atexit
+import functools
+import gzip
+import io
+import json
+import mmap
+import os
+import threading
+import uuid
+import re
+import time
+import logging
+import errno
+import shutil
+import random
+import secrets
+import copy
+
+try:
+    import orjson
+except ImportError:  # fall back to ujson, then stdlib, where the wheel is unavailable
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+app = Flask(__name__, static_folder='static', template_folder='templates')
+
+if orjson is not None:
+    try:
+        from flask.json.provider import JSONProvider
+    except ImportError:  # Flask < 2.2 has no provider API
+        JSONProvider = None
+
+    if JSONProvider is not None:
+        class OrjsonProvider(JSONProvider):
+            """Back request parsing and jsonify with orjson."""
+
+            def dumps(self, obj, **kwargs):
+                return orjson.dumps(obj).decode('utf-8')
+
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+
+        app.json = OrjsonProvider(app)
+
+# Basic logging for debugging slow I/O
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DATA_FILE = os.path.join(DATA_DIR, 'kanban.json')
+# Reentrant so mutating handlers can hold it across _load_data/_save_data,
+# which take it again internally
+_lock = threading.RLock()
+_io_lock = threading.Lock()  # serializes snapshot writers (flusher vs. sync flushes)
+
+
+def _with_board_lock(fn):
+    """Run a mutating handler entirely under _lock so concurrent requests
+    never interleave index lookups with in-place board mutation."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return fn(*args, **kwargs)
+    return wrapper
+
+# In-memory board state; reads are served from here and writes are flushed to
+# disk by a background thread so request handlers never wait on file I/O.
+_board_cache = None
+_board_bytes = None    # serialized board body, rebuilt lazily after mutations
+_board_gzip = None     # gzip of _board_bytes, same lifecycle
+_columns_bytes = None  # serialized /api/columns body, same lifecycle
+_projects_bytes = None  # serialized /api/projects body, same lifecycle
+_board_version = time.time_ns()  # bumped on every save; doubles as the ETag (time-seeded so restarts never reuse a value)
+_cache_mtime_ns = 0  # mtime of the snapshot the cache was loaded from/flushed to
+_dirty = False
+COMPRESS_MIN_SIZE = 512  # don't bother compressing tiny boards
+MAX_IMPORT_BYTES = 32 * 1024 * 1024  # reject board imports larger than this
+_flush_cond = threading.Condition(_lock)
+FLUSH_COALESCE_SECS = 0.05
+FLUSH_RETRY_SECS = 1.0  # back-off after a failed disk write
+
+# Lookup indexes over the cached board, rebuilt whenever the board changes
+# so handlers resolve ids in O(1) instead of scanning every column.
+_card_index = {}        # card id -> (column id, position within column)
+_columns_by_id = {}     # column id -> column dict
+_projects_by_name = {}  # project name -> project dict
+_cards_by_project = {}  # project name -> list of card dicts
+_used_colors = set()    # lowercased colors already taken by projects
+
+DEFAULT_CARD_COLOR = '#5b2e8a'
+
+# Stamped into the snapshot so loads of our own output can skip the full
+# normalization walk; bump when _normalize_board's output shape changes.
+NORMALIZED_VERSION = 2
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def _slug(s):
+    s = _SLUG_RE.sub('-', s.lower()).strip('-')
+    return s or uuid.uuid4().hex
+
+
+def _json_loads(buf):
+    if orjson is not None:
+        return orjson.loads(buf)
+    if ujson is not None:
+        return ujson.loads(buf)
+    return json.loads(buf)
+
+
+def _json_dumps(data):
+    """Serialize to compact bytes; the file is machine-read only."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    if ujson is not None:
+        return ujson.dumps(data).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+DEFAULT_BOARD = {
+    "columns": [
+    {"id": "todo", "title": "To Do", "cards": [], "color": "#1f77b4", "hidden": False},
+    {"id": "inprogress", "title": "In Progress", "cards": [], "color": "#ff8c00", "hidden": False},
+    {"id": "blocked", "title": "Blocked", "cards": [], "color": "#d62728", "hidden": False},
+    {"id": "done", "title": "Done", "cards": [], "color": "#2ca02c", "hidden": False}
+    ],
+    "projects": []
+}
+
+
+def _sanitize_card(card):
+    if not isinstance(card, dict):
+        return None
+    sanitized = {}
+    card_id = card.get('id')
+    if isinstance(card_id, str) and card_id:
+        sanitized['id'] = card_id
+    elif card_id:
+        sanitized['id'] = str(card_id)
+    else:
+        sanitized['id'] = uuid.uuid4().hex
+    sanitized['title'] = str(card.get('title') or '').strip() or 'Untitled'
+    sanitized['description'] = str(card.get('description') or '')
+    sanitized['links'] = _clean_links(card.get('links'))
+    project_name = (card.get('project') or '').strip()
+    if project_name:
+        sanitized['project'] = project_name
+    assignee = (card.get('assignee') or '').strip()
+    if assignee:
+        sanitized['assignee'] = assignee
+    color = card.get('color')
+    sanitized['color'] = color if color else DEFAULT_CARD_COLOR
+    return sanitized
+
+
+def _normalize_board(data):
+    if not isinstance(data, dict):
+        data = {}
+    data.pop('_normalized_version', None)
+    if 'columns' not in data or not isinstance(data['columns'], list):
+        data['columns'] = []
+    if 'projects' not in data or not isinstance(data['projects'], list):
+        data['projects'] = []
+
+    normalized_columns = []
+    for col in data['columns']:
+        if not isinstance(col, dict):
+            continue
+        col_id = col.get('id') or uuid.uuid4().hex
+        title = str(col.get('title') or '').strip() or 'Untitled'
+        color = col.get('color') or '#9aa0a6'
+        hidden = bool(col.get('hidden', False))
+        cards_payload = col.get('cards') if isinstance(col.get('cards'), list) else []
+        normalized_cards = []
+        seen_ids = set()
+        for card in cards_payload:
+            sanitized = _sanitize_card(card)
+            if not sanitized:
+                continue
+            if sanitized['id'] in seen_ids:
+                sanitized['id'] = uuid.uuid4().hex
+            seen_ids.add(sanitized['id'])
+            normalized_cards.append(sanitized)
+        normalized_columns.append({'id': col_id, 'title': title, 'color': color, 'hidden': hidden, 'cards': normalized_cards})
+
+    normalized_projects = []
+    seen_projects = set()
+    for proj in data['projects']:
+        if not isinstance(proj, dict):
+            continue
+        name = (proj.get('name') or '').strip()
+        if not name or name in seen_projects:
+            continue
+        normalized_projects.append({'name': name, 'color': proj.get('color') or DEFAULT_CARD_COLOR})
+        seen_projects.add(name)
+
+    data['columns'] = normalized_columns
+    data['projects'] = normalized_projects
+    return data
+
+
+def _get_projects(board):
+    projects = board.get('projects')
+    if not isinstance(projects, list):
+        projects = []
+        board['projects'] = projects
+    return projects
+
+
+def _generate_unique_color(board, attempts=32):
+    for _ in range(attempts):
+        color = f"#{random.randint(0, 0xFFFFFF):06x}"
+        if color not in _used_colors:
+            return color
+    return f"#{random.randint(0, 0xFFFFFF):06x}"
+
+
+def _ensure_project(board, project_name):
+    project_name = (project_name or '').strip()
+    if not project_name:
+        return None
+    existing = _projects_by_name.get(project_name)
+    if existing:
+        if not existing.get('color'):
+            existing['color'] = DEFAULT_CARD_COLOR
+        return existing
+    color = _generate_unique_color(board)
+    project = {'name': project_name, 'color': color}
+    _get_projects(board).append(project)
+    _projects_by_name[project_name] = project
+    _used_colors.add(color.lower())
+    return project
+
+
+def _find_project(board, project_name):
+    if not project_name:
+        return None
+    return _projects_by_name.get(project_name)
+
+
+def _apply_project_color_to_cards(board, project_name, color):
+    if not project_name:
+        return
+    for card in _cards_by_project.get(project_name, ()):
+        card['color'] = color if color else DEFAULT_CARD_COLOR
+
+
+def _update_project_references(board, old_name, new_name=None, project_color=None):
+    for card in _cards_by_project.get(old_name, ()):
+        if new_name:
+            card['project'] = new_name
+            if project_color:
+                card['color'] = project_color
+        else:
+            card.pop('project', None)
+            card['color'] = DEFAULT_CARD_COLOR
+    # Re-key the index immediately so later lookups in the same request
+    # (e.g. a rename+recolor PUT) see the cards under the new name
+    if new_name:
+        _cards_by_project[new_name] = _cards_by_project.pop(old_name, [])
+    else:
+        _cards_by_project.pop(old_name, None)
+
+
+def _rebuild_indexes(board):
+    _card_index.clear()
+    _columns_by_id.clear()
+    _projects_by_name.clear()
+    _cards_by_project.clear()
+    for col in board.get('columns', []):
+        _columns_by_id[col['id']] = col
+        for i, card in enumerate(col.get('cards', [])):
+            _card_index[card['id']] = (col['id'], i)
+            project_name = card.get('project')
+            if project_name:
+                _cards_by_project.setdefault(project_name, []).append(card)
+    _used_colors.clear()
+    for proj in board.get('projects', []):
+        if proj.get('name'):
+            _projects_by_name[proj['name']] = proj
+        if proj.get('color'):
+            _used_colors.add(proj['color'].lower())
+
+
+_data_file_ensured = False
+
+
+def _ensure_data_file():
+    global _data_file_ensured
+    if _data_file_ensured:
+        return
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+    if not os.path.exists(DATA_FILE):
+        logger.info('Creating new blank kanban board at %s', DATA_FILE)
+        _write_snapshot(DEFAULT_BOARD)
+    _data_file_ensured = True
+
+
+def _invalidate_payloads():
+    # Caller must hold _lock
+    global _board_bytes, _board_gzip, _columns_bytes, _projects_bytes
+    _board_bytes = None
+    _board_gzip = None
+    _columns_bytes = None
+    _projects_bytes = None
+
+
+def _load_data():
+    global _board_cache, _board_version, _cache_mtime_ns
+    with _lock:
+        if _board_cache is not None:
+            if _dirty:
+                # In-memory state is ahead of the file; never reload over it
+                return _board_cache
+            try:
+                mtime_ns = os.stat(DATA_FILE).st_mtime_ns
+            except OSError:
+                mtime_ns = _cache_mtime_ns
+            if mtime_ns == _cache_mtime_ns:
+                return _board_cache
+            # Snapshot was edited out-of-band; drop the cache and reload
+            logger.info('kanban.json changed on disk; reloading')
+            _board_cache = None
+    _ensure_data_file()
+    start = time.perf_counter()
+    mtime_ns = os.stat(DATA_FILE).st_mtime_ns
+    data = _read_snapshot()
+    if not (isinstance(data, dict) and data.pop('_normalized_version', None) == NORMALIZED_VERSION):
+        # Only externally produced or legacy files need the full walk
+        data = _normalize_board(data)
+    elapsed = time.perf_counter() - start
+    if elapsed > 0.5:
+        logger.warning('Slow _load_data: %.3fs', elapsed)
+    with _lock:
+        if _board_cache is None:
+            _board_cache = data
+            _invalidate_payloads()
+            _board_version += 1
+            _cache_mtime_ns = mtime_ns
+            _rebuild_indexes(_board_cache)
+        return _board_cache
+
+
+def _read_snapshot():
+    # Memory-map the file so the parser works straight off the page cache
+    # instead of a freshly allocated heap copy of the whole board.
+    with open(DATA_FILE, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Zero-length files cannot be mapped
+            return _json_loads(f.read())
+        with mm:
+            if orjson is not None:
+                view = memoryview(mm)
+                try:
+                    return _json_loads(view)
+                finally:
+                    view.release()
+            return _json_loads(mm.read())
+
+
+def _board_payload():
+    """Serialized board body, computed once per board state."""
+    global _board_bytes
+    _load_data()
+    # Read _board_cache under the lock: a concurrent import can swap the
+    # cache between the load above and the serialization, and caching bytes
+    # of the old object would pair stale content with the new ETag
+    with _lock:
+        if _board_bytes is None:
+            _board_bytes = _json_dumps(_board_cache)
+        return _board_bytes
+
+
+def _columns_payload():
+    global _columns_bytes
+    _load_data()
+    with _lock:
+        if _columns_bytes is None:
+            cols = [{'id': c['id'], 'title': c['title'], 'color': c.get('color'), 'hidden': bool(c.get('hidden', False))} for c in _board_cache['columns']]
+            _columns_bytes = _json_dumps({'columns': cols})
+        return _columns_bytes
+
+
+def _projects_payload():
+    global _projects_bytes
+    _load_data()
+    with _lock:
+        if _projects_bytes is None:
+            _projects_bytes = _json_dumps({'projects': _get_projects(_board_cache)})
+        return _projects_bytes
+
+
+def _board_payload_gzip():
+    global _board_gzip
+    with _lock:
+        # _lock is reentrant, so the nested call stays consistent with the
+        # _board_bytes we compress here
+        payload = _board_payload()
+        if _board_gzip is None:
+            _board_gzip = gzip.compress(payload, compresslevel=5)
+        return _board_gzip
+
+
+def _save_data(data):
+    # Update the cache and wake the flusher; the disk write happens off-thread
+    global _board_cache, _board_version, _dirty
+    with _flush_cond:
+        _board_cache = data
+        _invalidate_payloads()
+        _board_version += 1
+        _rebuild_indexes(_board_cache)
+        _dirty = True
+        if has_request_context():
+            # Defer the wake-up so several saves in one request notify once
+            g.board_dirty = True
+            return
+        _flush_cond.notify()
+
+
+def _fsync_dir(path):
+    # Flush directory metadata so the rename itself is durable
+    try:
+        dir_fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _write_snapshot_tmpfile(payload):
+    """Write via O_TMPFILE: the temp file has no name until it is published,
+    so a crash can never leave a stray or partially written file behind."""
+    if not hasattr(os, 'O_TMPFILE'):
+        return False
+    try:
+        fd = os.open(DATA_DIR, os.O_TMPFILE | os.O_WRONLY, 0o644)
+    except OSError:
+        # Filesystem (or kernel) without O_TMPFILE support
+        return False
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+        # linkat cannot replace an existing name, so give the anonymous file
+        # a temporary one and atomically rename it over the target.
+        tmp = f"{DATA_FILE}.{os.getpid()}.tmp"
+        try:
+            os.link(f"/proc/self/fd/{fd}", tmp, follow_symlinks=True)
+        except OSError:
+            # Some filesystems (e.g. overlayfs) refuse the /proc/self/fd
+            # link even though O_TMPFILE itself worked
+            return False
+        try:
+            os.replace(tmp, DATA_FILE)
+        except OSError:
+            os.remove(tmp)
+            raise
+    finally:
+        os.close(fd)
+    return True
+
+
+def _write_snapshot(data):
+    start = time.perf_counter()
+    payload = _json_dumps({**data, '_normalized_version': NORMALIZED_VERSION})
+    with _io_lock:
+        _publish_snapshot(payload)
+    global _cache_mtime_ns
+    _cache_mtime_ns = os.stat(DATA_FILE).st_mtime_ns
+    elapsed = time.perf_counter() - start
+    if elapsed > 0.5:
+        logger.warning('Slow _write_snapshot: %.3fs', elapsed)
+
+
+def _publish_snapshot(payload):
+    if not _write_snapshot_tmpfile(payload):
+        tmp = DATA_FILE + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp, DATA_FILE)
+        except OSError as exc:
+            # The temp file lives beside the target, so EXDEV can't happen on
+            # POSIX; only Windows can refuse a rename over an open file.
+            recoverable = {errno.EBUSY, errno.EACCES, errno.EPERM}
+            if os.name == 'nt' and exc.errno in recoverable:
+                shutil.copyfile(tmp, DATA_FILE)
+                os.remove(tmp)
+            else:
+                os.remove(tmp)
+                raise
+    _fsync_dir(DATA_DIR)
+
+
+def _flush_worker():
+    global _dirty
+    while True:
+        with _flush_cond:
+            while not _dirty:
+                _flush_cond.wait()
+            # Coalesce bursts of saves into a single disk write
+            _flush_cond.wait(FLUSH_COALESCE_SECS)
+            if not _dirty:
+                # A synchronous flush beat us to it during the wait
+                continue
+            data = copy.deepcopy(_board_cache)
+            _dirty = False
+        try:
+            _write_snapshot(data)
+        except Exception:
+            # The flusher must outlive transient disk errors (full volume,
+            # remount, ...): mark the state dirty again so this write is
+            # retried, and back off so a persistent failure doesn't spin.
+            logger.exception('Board flush failed; will retry')
+            with _flush_cond:
+                _dirty = True
+            time.sleep(FLUSH_RETRY_SECS)
+
+
+def _flush_pending():
+    global _dirty
+    with _flush_cond:
+        if not _dirty:
+            return
+        data = copy.deepcopy(_board_cache)
+        _dirty = False
+    try:
+        _write_snapshot(data)
+    except Exception:
+        with _flush_cond:
+            _dirty = True
+        raise
+
+
+# Ensure the data file exists as soon as the app module loads
+_ensure_data_file()
+
+_flush_thread = threading.Thread(target=_flush_worker, name='board-flusher', daemon=True)
+_flush_thread.start()
+atexit.register(_flush_pending)
+
+
+def _clean_links(raw_links):
+    """Return a list of {'text','url'} objects with minimal validation."""
+    if not isinstance(raw_links, list):
+        return []
+    cleaned = []
+    append = cleaned.append
+    for item in raw_links:
+        if not isinstance(item, dict):
+            continue
+        url = str(item.get('url') or '').strip()
+        if not url:
+            continue
+        text = str(item.get('text') or '').strip()
+        append({'text': text or url, 'url': url})
+    return cleaned
+
+
+def _merge_boards(existing, incoming):
+    # No deep copies needed: _normalize_board rebuilds every column, card and
+    # project dict, so nothing from the incoming payload can alias into the
+    # merged board it returns. The live cached board must not be touched
+    # before _save_data swaps the result in, though - normalize a shallow
+    # top-level copy so `existing`'s own columns/projects keys stay intact.
+    base = _normalize_board(dict(existing))
+    incoming_board = _normalize_board(incoming)
+
+    columns_lookup = {col['id']: col for col in base.get('columns', [])}
+    # Seed the dedupe sets in one pass instead of rebuilding per incoming column
+    existing_ids_by_col = {col['id']: {card['id'] for card in col.get('cards', [])}
+                           for col in base.get('columns', [])}
+    for inc_col in incoming_board.get('columns', []):
+        col_id = inc_col['id']
+        if col_id in columns_lookup:
+            target = columns_lookup[col_id]
+            target['title'] = inc_col.get('title', target['title'])
+            target['color'] = inc_col.get('color', target.get('color'))
+            target['hidden'] = bool(inc_col.get('hidden', target.get('hidden', False)))
+            existing_ids = existing_ids_by_col[col_id]
+            cards_list = target.setdefault('cards', [])
+            for card in inc_col.get('cards', []):
+                sanitized = _sanitize_card(card)
+                if not sanitized:
+                    continue
+                if sanitized['id'] in existing_ids:
+                    sanitized['id'] = uuid.uuid4().hex
+                existing_ids.add(sanitized['id'])
+                cards_list.append(sanitized)
+        else:
+            base.setdefault('columns', []).append(inc_col)
+            columns_lookup[col_id] = inc_col
+            existing_ids_by_col[col_id] = {card['id'] for card in inc_col.get('cards', [])}
+
+    projects = base.setdefault('projects', [])
+    project_lookup = {proj['name']: proj for proj in projects if proj.get('name')}
+    for proj in incoming_board.get('projects', []):
+        name = proj.get('name')
+        if not name:
+            continue
+        if name in project_lookup:
+            if proj.get('color'):
+                project_lookup[name]['color'] = proj['color']
+        else:
+            projects.append({'name': name, 'color': proj.get('color') or DEFAULT_CARD_COLOR})
+            project_lookup[name] = projects[-1]
+
+    # Both inputs were just normalized and the merge only adds sanitized
+    # pieces, so a final _normalize_board pass would be pure rework.
+    return base
+
+
+
+@app.teardown_request
+def _notify_flusher(exc):
+    if g.get('board_dirty'):
+        with _flush_cond:
+            _flush_cond.notify()
+
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+
+@app.route('/api/board', methods=['GET'])
+def get_board():
+    if request.args.get('pretty'):
+        # Human-readable variant; the snapshot itself is stored compact.
+        # Dump under the lock so a concurrent mutation can't tear the output
+        with _lock:
+            body = json.dumps(_load_data(), indent=2)
+        return app.response_class(body, mimetype='application/json')
+    _load_data()  # revalidates the cache (and version) before the ETag check
+    # Idle pollers get a bodyless 304 when the board hasn't changed
+    etag = f'W/"{_board_version}"'
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304, {'ETag': etag}
+    # Serve pre-serialized bytes; no per-request encode
+    payload = _board_payload()
+    if len(payload) >= COMPRESS_MIN_SIZE and request.accept_encodings.quality('gzip') > 0:
+        response = app.response_class(_board_payload_gzip(), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    else:
+        response = app.response_class(payload, mimetype='application/json')
+    response.headers['ETag'] = etag
+    return response
+
+
+@app.route('/api/board/export', methods=['GET'])
+def export_board():
+    # Serve the cached serialized board; no disk round-trip, and the bytes
+    # are always current since mutations invalidate them.
+    payload = _board_payload()
+    return send_file(io.BytesIO(payload), mimetype='application/json', as_attachment=True, download_name='kanban.json')
+
+
+@app.route('/api/board/import', methods=['POST'])
+@_with_board_lock
+def import_board():
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'error': 'Import file is required'}), 400
+    # Read in chunks with a hard cap so an oversized upload can't exhaust memory
+    buf = bytearray()
+    while True:
+        chunk = upload.stream.read(64 * 1024)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if len(buf) > MAX_IMPORT_BYTES:
+            return jsonify({'error': 'Import file too large'}), 413
+    try:
+        payload = _json_loads(buf)
+    except ValueError:
+        return jsonify({'error': 'Uploaded file is not valid JSON'}), 400
+
+    mode = (request.form.get('mode') or 'merge').lower()
+    if mode not in {'merge', 'replace'}:
+        mode = 'merge'
+
+    if mode == 'replace':
+        board = _normalize_board(payload)
+    else:
+        current = _load_data()
+        board = _merge_boards(current, payload)
+
+    _save_data(board)
+    return jsonify({'status': 'ok', 'mode': mode})
+
+
+@app.route('/api/card', methods=['POST'])
+@_with_board_lock
+def create_card():
+    data = request.get_json() or {}
+    title = data.get('title')
+    description = data.get('description', '')
+    column_id = data.get('column', 'todo')
+    color = data.get('color')
+    hidden = data.get('hidden')
+    project_name = (data.get('project') or '').strip()
+    assignee = (data.get('assignee') or '').strip()
+    links = _clean_links(data.get('links'))
+    if not title:
+        return jsonify({'error': 'title required'}), 400
+
+    board = _load_data()
+    # Resolve the column first so a bad id can't leave a half-created
+    # project behind in the shared cache
+    col = _columns_by_id.get(column_id)
+    if col is None:
+        return jsonify({'error': 'column not found'}), 404
+
+    card = {
+        'id': uuid.uuid4().hex,
+        'title': title,
+        'description': description,
+        'links': links
+    }
+    if assignee:
+        card['assignee'] = assignee
+    project_details = None
+    if project_name:
+        project_details = _ensure_project(board, project_name)
+        card['project'] = project_name
+        if project_details and project_details.get('color'):
+            card['color'] = project_details['color']
+
+    if color and not project_details:
+        card['color'] = color
+    if 'color' not in card:
+        card['color'] = DEFAULT_CARD_COLOR
+
+    col['cards'].append(card)
+    _save_data(board)
+    return jsonify(card), 201
+
+
+@app.route('/api/card/<card_id>', methods=['PUT'])
+@_with_board_lock
+def update_card(card_id):
+    data = request.get_json() or {}
+    target_col = data.get('column')
+    position = data.get('position')  # optional integer
+    title = data.get('title')
+    description = data.get('description')
+    color = data.get('color')
+    links = data.get('links')
+    project_payload = data.get('project') if 'project' in data else None
+    assignee_payload = data.get('assignee') if 'assignee' in data else None
+
+    board = _load_data()
+    # find the card via the id index
+    entry = _card_index.get(card_id)
+    if entry is None:
+        return jsonify({'error': 'card not found'}), 404
+    original_column_id, original_position = entry
+
+    # Validate the destination and position before touching the shared board:
+    # no early return below this point may leave the cache half-mutated
+    destination_column_id = target_col or original_column_id
+    destination_column = _columns_by_id.get(destination_column_id)
+    if target_col and destination_column is None:
+        return jsonify({'error': 'target column not found'}), 404
+    if destination_column is None:
+        destination_column = board['columns'][0]
+    if position is not None:
+        try:
+            position = int(position)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'position must be an integer'}), 400
+
+    card_obj = _columns_by_id[original_column_id]['cards'].pop(original_position)
+
+    # update fields
+    if title is not None:
+        card_obj['title'] = title
+    if description is not None:
+        card_obj['description'] = description
+    if color is not None:
+        card_obj['color'] = color
+    project_details = None
+    if project_payload is not None:
+        normalized_project = (project_payload or '').strip()
+        if normalized_project:
+            project_details = _ensure_project(board, normalized_project)
+            card_obj['project'] = normalized_project
+            if project_details and project_details.get('color'):
+                card_obj['color'] = project_details['color']
+        else:
+            card_obj.pop('project', None)
+            if color is None:
+                card_obj['color'] = DEFAULT_CARD_COLOR
+    if assignee_payload is not None:
+        normalized_assignee = (assignee_payload or '').strip()
+        if normalized_assignee:
+            card_obj['assignee'] = normalized_assignee
+        else:
+            card_obj.pop('assignee', None)
+    if links is not None:
+        card_obj['links'] = _clean_links(links)
+
+    if card_obj.get('project'):
+        if project_details is None:
+            # Only look up when _ensure_project didn't already hand it to us
+            project_details = _find_project(board, card_obj['project'])
+        if project_details and project_details.get('color'):
+            card_obj['color'] = project_details['color']
+    elif 'color' not in card_obj:
+        card_obj['color'] = DEFAULT_CARD_COLOR
+
+    # place into target column
+    if target_col:
+        # honor supplied position when explicitly moving columns
+        if position is None or position >= len(destination_column['cards']):
+            destination_column['cards'].append(card_obj)
+        else:
+            destination_column['cards'].insert(max(0, position), card_obj)
+    else:
+        # keep original relative order when staying in same column
+        insert_idx = original_position if original_position is not None else len(destination_column['cards'])
+        insert_idx = min(insert_idx, len(destination_column['cards']))
+        destination_column['cards'].insert(insert_idx, card_obj)
+
+    _save_data(board)
+    return jsonify(card_obj)
+
+
+@app.route('/api/card/<card_id>', methods=['DELETE'])
+@_with_board_lock
+def delete_card(card_id):
+    board = _load_data()
+    entry = _card_index.get(card_id)
+    if entry is None:
+        return jsonify({'error': 'card not found'}), 404
+    col_id, position = entry
+    del _columns_by_id[col_id]['cards'][position]
+    _save_data(board)
+    return jsonify({'deleted': True})
+
+
+@app.route('/api/columns', methods=['GET'])
+def get_columns():
+    return app.response_class(_columns_payload(), mimetype='application/json')
+
+
+@app.route('/api/column', methods=['POST'])
+@_with_board_lock
+def create_column():
+    data = request.get_json() or {}
+    title = data.get('title')
+    position = data.get('position')
+    color = data.get('color') or '#9aa0a6'
+    if not title:
+        return jsonify({'error': 'title required'}), 400
+    board = _load_data()
+
+    col_id = _slug(title)
+    if col_id in _columns_by_id:
+        col_id = f"{col_id}-{secrets.token_hex(4)}"
+
+    hidden = bool(data.get('hidden', False))
+    col = {'id': col_id, 'title': title, 'cards': [], 'color': color, 'hidden': hidden}
+    if position is None or position >= len(board['columns']):
+        board['columns'].append(col)
+    else:
+        board['columns'].insert(max(0, int(position)), col)
+    _save_data(board)
+    return jsonify(col), 201
+
+
+@app.route('/api/column/<col_id>', methods=['PUT'])
+@_with_board_lock
+def update_column(col_id):
+    data = request.get_json() or {}
+    title = data.get('title')
+    position = data.get('position')
+    color = data.get('color')
+    hidden = data.get('hidden')
+    board = _load_data()
+    col = _columns_by_id.get(col_id)
+    if col is None:
+        return jsonify({'error': 'column not found'}), 404
+    if title is not None:
+        col['title'] = title
+    if color is not None:
+        col['color'] = color
+    if hidden is not None:
+        col['hidden'] = bool(hidden)
+    if position is not None:
+        pos = max(0, int(position))
+        board['columns'].remove(col)
+        board['columns'].insert(min(pos, len(board['columns'])), col)
+    _save_data(board)
+    return jsonify(col)
+
+
+@app.route('/api/column/<col_id>', methods=['DELETE'])
+@_with_board_lock
+def delete_column(col_id):
+    data = request.get_json() or {}
+    move_to = data.get('move_to')
+    board = _load_data()
+    col = _columns_by_id.get(col_id)
+    if col is None:
+        return jsonify({'error': 'column not found'}), 404
+    board['columns'].remove(col)
+    if move_to:
+        target = _columns_by_id.get(move_to)
+        if target is not None and target is not col:
+            target['cards'].extend(col.get('cards', []))
+    _save_data(board)
+    return jsonify({'deleted': True})
+
+
+@app.route('/api/projects', methods=['GET'])
+def get_projects():
+    return app.response_class(_projects_payload(), mimetype='application/json')
+
+
+@app.route('/api/project', methods=['POST'])
+@_with_board_lock
+def create_project():
+    data = request.get_json() or {}
+    name = (data.get('name') or '').strip()
+    color = data.get('color')
+    position = data.get('position')
+    if not name:
+        return jsonify({'error': 'name required'}), 400
+
+    board = _load_data()
+    projects = _get_projects(board)
+    if name in _projects_by_name:
+        return jsonify({'error': 'project name must be unique'}), 400
+    if not color:
+        color = _generate_unique_color(board)
+    project = {'name': name, 'color': color}
+    _used_colors.add(color.lower())
+
+    if position is None or position >= len(projects):
+        projects.append(project)
+    else:
+        insert_idx = max(0, int(position))
+        projects.insert(insert_idx, project)
+
+    _save_data(board)
+    return jsonify(project), 201
+
+
+@app.route('/api/project/<int:project_idx>', methods=['PUT'])
+@_with_board_lock
+def update_project(project_idx):
+    data = request.get_json() or {}
+    board = _load_data()
+    projects = _get_projects(board)
+
+    if project_idx < 0 or project_idx >= len(projects):
+        return jsonify({'error': 'project not found'}), 404
+
+    project = projects[project_idx]
+    name = data.get('name')
+    color = data.get('color')
+    position = data.get('position')
+
+    if name is not None:
+        name = name.strip()
+        if not name:
+            return jsonify({'error': 'name required'}), 400
+        clash = _projects_by_name.get(name)
+        if clash is not None and clash is not project:
+            return jsonify({'error': 'project name must be unique'}), 400
+        old_name = project.get('name')
+        if name != old_name:
+            project['name'] = name
+            _update_project_references(board, old_name, name, project.get('color'))
+    if color is not None:
+        project['color'] = color
+        _apply_project_color_to_cards(board, project['name'], color)
+
+    if position is not None:
+        mover = projects.pop(project_idx)
+        insert_idx = max(0, int(position))
+        if insert_idx > len(projects):
+            insert_idx = len(projects)
+        projects.insert(insert_idx, mover)
+
+    _save_data(board)
+    return jsonify(project)
+
+
+@app.route('/api/project/<int:project_idx>', methods=['DELETE'])
+@_with_board_lock
+def delete_project(project_idx):
+    board = _load_data()
+    projects = _get_projects(board)
+
+    if project_idx < 0 or project_idx >= len(projects):
+        return jsonify({'error': 'project not found'}), 404
+
+    removed = projects.pop(project_idx)
+    _update_project_references(board, removed.get('name'), None)
+    _save_data(board)
+    return jsonify({'deleted': True})
+
+
+if __name__ == '__main__':
+    # Dev convenience only; run under gunicorn in production (see README).
+    # Keep a single process: the board cache lives in module state.
+    _ensure_data_file()
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import sys
 from pathlib import Path
 
 from PIL import Image, ImageDraw
@@ -9,6 +11,7 @@ STATIC_DIR = ROOT / "static"
 STATIC_DIR.mkdir(exist_ok=True)
 
 ICON_PATH = STATIC_DIR / "favicon.ico"
+STAMP_PATH = STATIC_DIR / "favicon.ico.stamp"
 
 SIZE = 256
 BG = (0, 0, 0, 0)
@@ -20,6 +23,16 @@ PADDING = 28
 CORNER_RADIUS = 48
 LINE_WIDTH = 18
 
+# Skip the rasterize/encode entirely when neither the drawing parameters
+# nor this script have changed since the icon was last built.
+_inputs = (SIZE, BG, BORDER_COLOR, PANEL_FILL, HEADER_FILL, PADDING, CORNER_RADIUS, LINE_WIDTH,
+           Path(__file__).stat().st_mtime_ns)
+STAMP = hashlib.sha256(repr(_inputs).encode()).hexdigest()[:16]
+
+if ICON_PATH.exists() and STAMP_PATH.exists() and STAMP_PATH.read_text() == STAMP:
+    print(f"favicon up to date at {ICON_PATH}")
+    sys.exit(0)
+
 img = Image.new("RGBA", (SIZE, SIZE), BG)
 draw = ImageDraw.Draw(img)
 
@@ -43,4 +56,5 @@ body_top = header_bottom + LINE_WIDTH / 2
 draw.line(((table_left, body_top), (table_right, body_top)), fill=LINE_COLOR, width=LINE_WIDTH // 2)
 
 img.save(ICON_PATH, sizes=[(64, 64), (48, 48), (32, 32), (16, 16)])
+STAMP_PATH.write_text(STAMP)
 print(f"favicon saved to {ICON_PATH}")